@@ -7,6 +7,7 @@ Classes:
 
 TextProcessing: A class containing various methods for processing and manipulating text.
 EmailHandler: A class that provides functionality for handling and processing email-related tasks.
+MailSink: A class that writes rendered emails to a Maildir, an mbox file or a directory of .eml files instead of sending them.
 Functions:
 
 utility_function_1: A general utility function for performing a specific task (e.g., data transformation, parsing, etc.)
@@ -15,7 +16,8 @@ common_imports: A collection of common and frequently used imports to be used ac
 
 from .text_processing import TextProcessing
 from .email_handler import EmailHandler
+from .mail_sink import MailSink
 from .utils import utility_function_1
 from .common_imports import *
 
-__all__ = ['TextProcessing', 'EmailHandler', 'utility_function_1', 'commun_imports']
+__all__ = ['TextProcessing', 'EmailHandler', 'MailSink', 'utility_function_1', 'commun_imports']
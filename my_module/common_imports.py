@@ -13,6 +13,7 @@ pathlib.Path: A class for working with filesystem paths in a platform-independen
 stanza: A library for natural language processing, providing tokenization, part-of-speech tagging, and more.
 spacy: A library for advanced natural language processing, including tokenization, parsing, and named entity recognition.
 transformers: A library for working with state-of-the-art natural language processing models, such as BERT, GPT, and others.
+torch: A library for tensor computation, used to run and quantize the transformer models on CPU.
 openai: A library for working with the OpenAI API.
 nltk: A library for natural language processing, providing tokenization, stemming, and more.
 langid: A library for language identification.
@@ -20,6 +21,7 @@ conceptnet_lite: A library for working with the ConceptNet knowledge graph.
 dotenv: A library for loading environment variables from a .env file.
 pickle: A library for serializing and deserializing Python objects.
 logging: A library for logging messages in a flexible and configurable way.
+threading: A library for thread synchronization primitives such as locks.
 To use these libraries in your code, simply import the required modules and functions as needed.
 """
 
@@ -44,6 +46,7 @@ from spacy.lang.ru.examples import sentences
 from spacy.lang.sv.examples import sentences
 from spacy.lang.zh.examples import sentences
 from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
+import torch
 import openai
 import nltk
 from nltk.tokenize import word_tokenize
@@ -52,5 +55,6 @@ import conceptnet_lite
 from dotenv import load_dotenv
 import pickle
 import logging
+import threading
 import json
 
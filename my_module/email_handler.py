@@ -81,6 +81,79 @@ class EmailHandler:
         else:
             return "unknown"
 
+    def format_email_message(self, recipient_email, message, ai_person, blank):
+        """
+        Formats the email message for a single recipient.
+
+        Args:
+            recipient_email (str): The recipient email address.
+            message (str): The email message.
+            ai_person (str): The name of the AI persona to use when formatting the message.
+            blank (bool): Whether to send the message without any formatting or text generation.
+
+        Returns:
+            str: The formatted message.
+        """
+        if not blank:
+            return self.text_processing.format_message(message, recipient_email, ai_person)
+        return message
+
+    def build_email(self, subject, formatted_message, attachment_path):
+        """
+        Builds the MIME message for a formatted email message.
+
+        Args:
+            subject (str): The email subject.
+            formatted_message (str): The formatted email message.
+            attachment_path (str): The path to the file to be attached to the email (optional).
+
+        Returns:
+            bytes: The encoded email body.
+        """
+        if attachment_path:
+            msg = MIMEMultipart()
+            msg['Subject'] = subject
+
+            # Add the message body
+            msg.attach(MIMEText(formatted_message, "plain"))
+
+            # Add the attachment
+            filename = os.path.basename(attachment_path)
+            with open(attachment_path, "rb") as attachment:
+                part = MIMEBase("application", "octet-stream")
+                part.set_payload(attachment.read())
+                encoders.encode_base64(part)
+                part.add_header("Content-Disposition", f"attachment; filename={filename}")
+                msg.attach(part)
+            email_body = msg.as_string()
+        else:
+            email_body = f"Subject: {subject}\n\n{formatted_message}"
+
+        return email_body.encode("utf-8")
+
+    def render_email(self, recipient_email, subject, message, attachment_path, ai_person, blank):
+        """
+        Renders the email for a single recipient: formats the message, checks it for spam and builds the MIME message.
+
+        Args:
+            recipient_email (str): The recipient email address.
+            subject (str): The email subject.
+            message (str): The email message.
+            attachment_path (str): The path to the file to be attached to the email (optional).
+            ai_person (str): The name of the AI persona to use when formatting the message.
+            blank (bool): Whether to send the message without any formatting or text generation.
+
+        Returns:
+            bytes: The encoded email body, or None if the email might be flagged as spam.
+        """
+        formatted_message = self.format_email_message(recipient_email, message, ai_person, blank)
+
+        if self.text_processing.is_spam_combined(formatted_message):
+            print(f"Warning: Email to {recipient_email} might be flagged as spam. Skipping.")
+            return None
+
+        return self.build_email(subject, formatted_message, attachment_path)
+
     def send_email(self, sender_email, sender_password, recipient_emails, subject, message, attachment_path, ai_person, service, blank):
         """
         Sends an email to multiple recipients with an optional attachment.
@@ -115,37 +188,14 @@ class EmailHandler:
             return
 
         for recipient_email in recipient_emails:
-            if not blank:
-                 formatted_message = self.text_processing.format_message(message, recipient_email, ai_person)
-            else:
-                formatted_message = message
-
-        
-
-            if self.text_processing.is_spam_combined(formatted_message):
-                print(f"Warning: Email to {recipient_email} might be flagged as spam. Skipping.")
+            try:
+                email_body = self.render_email(recipient_email, subject, message, attachment_path, ai_person, blank)
+            except Exception as e:
+                print(f"Error rendering email to {recipient_email}: {e}")
+                continue
+            if email_body is None:
                 continue
 
-            if attachment_path:
-                msg = MIMEMultipart()
-                msg['Subject'] = subject
-
-                # Add the message body
-                msg.attach(MIMEText(formatted_message, "plain"))
-
-                # Add the attachment
-                filename = os.path.basename(attachment_path)
-                with open(attachment_path, "rb") as attachment:
-                    part = MIMEBase("application", "octet-stream")
-                    part.set_payload(attachment.read())
-                    encoders.encode_base64(part)
-                    part.add_header("Content-Disposition", f"attachment; filename={filename}")
-                    msg.attach(part)
-                email_body = msg.as_string()
-            else:
-                email_body = f"Subject: {subject}\n\n{formatted_message}"
-
-            email_body = email_body.encode("utf-8")
             try:
                 server.sendmail(sender_email, recipient_email, email_body)
                 print(f"Email sent to {recipient_email}")
@@ -175,6 +225,7 @@ def send_emails_concurrently(email_handler, sender_email, sender_password, recip
     """
     # Divide the recipient_emails list into equal-sized chunks
     print("send_emails_concurrently called")
+    email_handler.text_processing.bert_classifier.limit_threads(num_workers)
     chunk_size = len(recipient_emails) // num_workers + (len(recipient_emails) % num_workers > 0)
     email_chunks = [recipient_emails[i:i + chunk_size] for i in range(0, len(recipient_emails), chunk_size)]
 
@@ -185,4 +236,69 @@ def send_emails_concurrently(email_handler, sender_email, sender_password, recip
                 future.result()
             except Exception as e:
                 print(f"Error sending email: {e}")
-    
+
+
+def render_emails_to_sink(email_handler, sink, sender_email, recipient_emails, subject, message, attachment_path, ai_person, blank=False, num_workers=10):
+    """
+    This function renders emails for multiple recipients using an EmailHandler instance and writes them to a MailSink instead of sending them.
+
+    The recipients are processed in chunks of sink.buffer_size: the messages of a chunk are formatted concurrently, checked for spam
+    with BERT in one batch, then built concurrently and handed to the sink, so every chunk reaches disk before the next one is rendered.
+    Recipients that fail to render are recorded in the manifest with the "error" status.
+
+    Args:
+    email_handler (EmailHandler): An instance of the EmailHandler class, responsible for handling and processing email-related tasks.
+    sink (MailSink): The sink the rendered emails are written to.
+    sender_email (str): The email address of the sender.
+    recipient_emails (list): A list of email addresses to render the email for.
+    subject (str): The subject of the email.
+    message (str): The content of the email.
+    attachment_path (str): The path to a file to be attached to the email (optional).
+    ai_person (str): The name of the AI persona used for communication (optional).
+    num_workers (int, optional): The number of worker threads for rendering emails concurrently. Default is 10.
+
+    Returns:
+    Path: The path of the manifest file written by the sink.
+    """
+    text_processing = email_handler.text_processing
+
+    def record_error(recipient_email, e):
+        print(f"Error rendering email to {recipient_email}: {e}")
+        sink.skip(sender_email, recipient_email, subject, str(e), status="error")
+
+    def format_recipient(recipient_email):
+        try:
+            return email_handler.format_email_message(recipient_email, message, ai_person, blank)
+        except Exception as e:
+            record_error(recipient_email, e)
+            return None
+
+    def finish_recipient(recipient_email, formatted_message, bert_result):
+        try:
+            if bert_result or text_processing.classify_message(formatted_message) == "spam":
+                print(f"Warning: Email to {recipient_email} might be flagged as spam. Skipping.")
+                sink.skip(sender_email, recipient_email, subject, "spam")
+                return
+            sink.add(sender_email, recipient_email, subject, email_handler.build_email(subject, formatted_message, attachment_path))
+        except Exception as e:
+            record_error(recipient_email, e)
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        for start in range(0, len(recipient_emails), sink.buffer_size):
+            chunk = recipient_emails[start:start + sink.buffer_size]
+            formatted_messages = list(executor.map(format_recipient, chunk))
+            recipients = [recipient_email for recipient_email, formatted_message in zip(chunk, formatted_messages) if formatted_message is not None]
+            formatted_messages = [formatted_message for formatted_message in formatted_messages if formatted_message is not None]
+
+            try:
+                bert_results = text_processing.is_spam_bert_batch(formatted_messages)
+            except Exception as e:
+                for recipient_email in recipients:
+                    record_error(recipient_email, e)
+                continue
+
+            list(executor.map(finish_recipient, recipients, formatted_messages, bert_results))
+
+    manifest_path = sink.close()
+    print(f"Rendered emails written to {sink.path}, manifest: {manifest_path}")
+    return manifest_path
@@ -0,0 +1,161 @@
+import json
+import logging
+import mailbox
+import threading
+import time
+import uuid
+from email.parser import BytesHeaderParser
+from email.utils import formatdate, make_msgid
+from pathlib import Path
+
+
+class MailSink:
+    """
+    The MailSink class writes rendered emails to a Maildir, an mbox file or a directory of .eml files instead of
+    sending them, together with a manifest of what would have been sent.
+    """
+    FORMATS = ("eml", "maildir", "mbox")
+
+    def __init__(self, path, sink_format="eml", buffer_size=100):
+        """
+        Initialize the sink and create its output location.
+
+        Args:
+            path (str): The output Maildir directory, mbox file or .eml directory.
+            sink_format (str): The output format: "eml", "maildir" or "mbox" (default: "eml").
+            buffer_size (int): The number of rendered emails buffered in memory before they are written in bulk.
+
+        Raises:
+            ValueError: If an invalid or unsupported sink format is provided.
+        """
+        if sink_format not in self.FORMATS:
+            raise ValueError(f"Invalid sink format provided: {sink_format}. Options: {', '.join(self.FORMATS)}.")
+
+        self.path = Path(path).resolve()
+        self.sink_format = sink_format
+        self.buffer_size = buffer_size
+        self.manifest_path = self.path.with_name(self.path.name + ".manifest.json")
+        self.buffer = []
+        self.manifest = []
+        self.lock = threading.Lock()
+
+        if sink_format == "eml":
+            self.path.mkdir(parents=True, exist_ok=True)
+            self.mailbox = None
+        elif sink_format == "maildir":
+            self.mailbox = mailbox.Maildir(self.path, create=True)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.mailbox = mailbox.mbox(self.path, create=True)
+
+    def add(self, sender_email, recipient_email, subject, email_body):
+        """
+        Adds a rendered email to the sink. Emails are buffered and written once the buffer is full.
+
+        The From, To, Date and Message-ID headers are added when the email does not have them, so a spooled email
+        carries its own envelope and can be re-sent without the manifest.
+
+        Args:
+            sender_email (str): The sender's email address.
+            recipient_email (str): The recipient email address.
+            subject (str): The email subject.
+            email_body (bytes): The encoded email body, as it would have been passed to sendmail.
+        """
+        email_body = self._add_envelope_headers(sender_email, recipient_email, email_body)
+        with self.lock:
+            self.buffer.append((sender_email, recipient_email, subject, email_body))
+            if len(self.buffer) >= self.buffer_size:
+                self._write_buffer()
+
+    def _add_envelope_headers(self, sender_email, recipient_email, email_body):
+        """
+        Prepends the envelope headers missing from an encoded email.
+
+        Args:
+            sender_email (str): The sender's email address.
+            recipient_email (str): The recipient email address.
+            email_body (bytes): The encoded email.
+
+        Returns:
+            bytes: The encoded email with the From, To, Date and Message-ID headers.
+        """
+        headers = BytesHeaderParser().parsebytes(email_body)
+        missing = {"From": sender_email, "To": recipient_email, "Date": formatdate(localtime=True), "Message-ID": make_msgid()}
+        lines = [f"{name}: {value}\n" for name, value in missing.items() if value and name not in headers]
+        return "".join(lines).encode("utf-8") + email_body
+
+    def skip(self, sender_email, recipient_email, subject, reason, status="skipped"):
+        """
+        Records in the manifest an email that was not rendered.
+
+        Args:
+            sender_email (str): The sender's email address.
+            recipient_email (str): The recipient email address.
+            subject (str): The email subject.
+            reason (str): Why the email was skipped (e.g., "spam"), or the error that stopped it from rendering.
+            status (str): "skipped" for emails left out on purpose, "error" for emails that failed to render.
+        """
+        with self.lock:
+            self.manifest.append({"sender": sender_email, "recipient": recipient_email, "subject": subject, "status": status, "reason": reason})
+
+    def flush(self):
+        """
+        Writes all buffered emails to the output location.
+        """
+        with self.lock:
+            self._write_buffer()
+
+    def close(self):
+        """
+        Writes the remaining buffered emails, closes the mailbox and writes the manifest.
+
+        Returns:
+            Path: The path of the manifest file.
+        """
+        with self.lock:
+            self._write_buffer()
+            if self.mailbox is not None:
+                self.mailbox.close()
+
+            with open(self.manifest_path, "w", encoding="utf-8") as file:
+                json.dump({"format": self.sink_format, "path": str(self.path), "messages": self.manifest}, file, indent=2)
+
+        return self.manifest_path
+
+    def _write_buffer(self):
+        """
+        Writes the buffered emails in one batch. The caller must hold the lock.
+
+        Emails that were written are removed from the buffer even if a later one fails, so they are not written twice.
+        """
+        if not self.buffer:
+            return
+
+        written = 0
+        if self.sink_format == "mbox":
+            self.mailbox.lock()
+        try:
+            for sender_email, recipient_email, subject, email_body in self.buffer:
+                if self.sink_format == "eml":
+                    # Unique names like Maildir keys, so a reused output directory is appended to, not overwritten
+                    key = f"{time.time_ns()}.{uuid.uuid4().hex}.eml"
+                    with open(self.path / key, "wb") as file:
+                        file.write(email_body)
+                elif self.sink_format == "mbox":
+                    mbox_message = mailbox.mboxMessage(email_body)
+                    mbox_message.set_from(sender_email or "MAILER-DAEMON")
+                    key = self.mailbox.add(mbox_message)
+                else:
+                    key = self.mailbox.add(email_body)
+
+                self.manifest.append({"sender": sender_email, "recipient": recipient_email, "subject": subject, "status": "rendered", "file": str(key), "size": len(email_body)})
+                written += 1
+
+            if self.sink_format == "mbox":
+                self.mailbox.flush()
+        finally:
+            if self.sink_format == "mbox":
+                self.mailbox.unlock()
+            self.buffer = self.buffer[written:]
+
+        logging.info(f"Wrote {written} emails to {self.path}")
@@ -2,15 +2,151 @@ from .common_imports import *
 from .utils import *
 
 
+BERT_MODEL_NAME = "distilbert-base-uncased-finetuned-sst-2-english"
+BERT_BACKENDS = ("pytorch", "quantized", "onnx")
+
+
+class BertSpamClassifier:
+    """
+    The BertSpamClassifier class loads the BERT spam model once for a CPU inference backend and classifies emails in batches.
+    """
+
+    def __init__(self, backend="pytorch", num_threads=None, batch_size=16, cache_dir=None):
+        """
+        Load the tokenizer and the model for the given backend.
+
+        Args:
+            backend (str): "pytorch" for the full-precision model, "quantized" for dynamically quantized int8 weights
+                or "onnx" for the model exported to ONNX Runtime.
+            num_threads (int): The number of intra-op threads to use for inference (optional).
+            batch_size (int): The maximum number of emails classified in one forward pass.
+            cache_dir (str): The directory the ONNX export is saved to and loaded from (optional, "onnx" backend only).
+
+        Raises:
+            ValueError: If an invalid or unsupported backend is provided.
+            ImportError: If the "onnx" backend is selected and optimum[onnxruntime] is not installed.
+        """
+        if backend not in BERT_BACKENDS:
+            raise ValueError(f"Invalid BERT backend provided: {backend}. Options: {', '.join(BERT_BACKENDS)}.")
+
+        self.backend = backend
+        self.num_threads = num_threads
+        self.batch_size = batch_size
+        # Fast tokenizers keep their padding/truncation state in Rust and raise "Already borrowed" when two threads
+        # tokenize at the same time, so tokenization is serialized; the forward pass is not.
+        self.tokenizer_lock = threading.Lock()
+
+        if num_threads:
+            torch.set_num_threads(num_threads)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(BERT_MODEL_NAME)
+
+        if backend == "onnx":
+            self.model = self.load_onnx_model(num_threads, cache_dir)
+        else:
+            model = AutoModelForSequenceClassification.from_pretrained(BERT_MODEL_NAME)
+            model.eval()
+            if backend == "quantized":
+                model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            self.model = model
+
+    def load_onnx_model(self, num_threads=None, cache_dir=None):
+        """
+        Load the BERT model with ONNX Runtime, exporting it to cache_dir on first use.
+
+        Args:
+            num_threads (int): The number of intra-op threads to use for inference (optional).
+            cache_dir (str): The directory the ONNX export is saved to and loaded from (optional).
+
+        Returns:
+            ORTModelForSequenceClassification: The ONNX Runtime model.
+        """
+        try:
+            import onnxruntime
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+        except ImportError as e:
+            raise ImportError("The 'onnx' BERT backend requires optimum[onnxruntime] to be installed.") from e
+
+        session_options = onnxruntime.SessionOptions()
+        if num_threads:
+            session_options.intra_op_num_threads = num_threads
+
+        if cache_dir is not None and (Path(cache_dir) / "model.onnx").exists():
+            return ORTModelForSequenceClassification.from_pretrained(cache_dir, export=False, session_options=session_options)
+
+        model = ORTModelForSequenceClassification.from_pretrained(BERT_MODEL_NAME, export=True, session_options=session_options)
+        if cache_dir is not None:
+            model.save_pretrained(cache_dir)
+        return model
+
+    def limit_threads(self, num_workers):
+        """
+        Share the cores between concurrent callers so that num_workers threads do not each use every core.
+        Has no effect if num_threads was set explicitly or for the "onnx" backend, whose threads are fixed at load time.
+
+        Args:
+            num_workers (int): The number of threads that will run inference concurrently.
+        """
+        if self.num_threads is None and self.backend != "onnx":
+            torch.set_num_threads(max(1, (os.cpu_count() or 1) // num_workers))
+
+    def scores(self, email_contents):
+        """
+        Compute the class probabilities for a list of emails.
+
+        The emails are sorted by length and classified in batches of batch_size, each batch padded only to its
+        longest email, so short emails do not pay for the padding of long ones.
+
+        Args:
+            email_contents (list): The email contents to be classified.
+
+        Returns:
+            list: A list of probability lists, one per email, in the same order as email_contents.
+        """
+        order = sorted(range(len(email_contents)), key=lambda i: len(email_contents[i]))
+        scores = [None] * len(email_contents)
+
+        for start in range(0, len(order), self.batch_size):
+            batch_indices = order[start:start + self.batch_size]
+            with self.tokenizer_lock:
+                inputs = self.tokenizer([email_contents[i] for i in batch_indices], padding=True, truncation=True, return_tensors="pt")
+            with torch.no_grad():
+                logits = self.model(**inputs).logits
+            probabilities = torch.softmax(logits, dim=-1).tolist()
+            for i, probability in zip(batch_indices, probabilities):
+                scores[i] = probability
+
+        return scores
+
+    def labels(self, email_contents):
+        """
+        Classify a list of emails with the model's labels.
+
+        Args:
+            email_contents (list): The email contents to be classified.
+
+        Returns:
+            list: A list of labels, one per email.
+        """
+        id2label = self.model.config.id2label
+        return [id2label[probabilities.index(max(probabilities))] for probabilities in self.scores(email_contents)]
+
 
 class TextProcessing:
     """
     The TextProcessing class provides methods for processing and classifying text, such as detecting spam or generating formal text.
     """
 
-    def __init__(self, pickle_directory, openai_api_key):
+    def __init__(self, pickle_directory, openai_api_key, bert_backend="pytorch", bert_num_threads=None, bert_batch_size=16):
         """
         Initialize the natural language processing models, spam classifier, and word features.
+
+        Args:
+            pickle_directory (str): The directory containing the spam classifier and word features pickle files.
+            openai_api_key (str): The OpenAI API key.
+            bert_backend (str): The inference backend for the BERT spam model: "pytorch", "quantized" (dynamic int8) or "onnx" (ONNX Runtime).
+            bert_num_threads (int): The number of intra-op threads used for BERT inference (optional).
+            bert_batch_size (int): The maximum number of messages classified in one forward pass by is_spam_bert_batch.
         """
         self.pickle_directory = pickle_directory
         self.openai_api_key = openai_api_key
@@ -36,6 +172,8 @@ class TextProcessing:
         with open(Path(self.pickle_directory) / "word_features.pickle", "rb") as f:
             self.word_features = pickle.load(f)
 
+        # Load the BERT spam model once for the selected backend instead of on every call
+        self.bert_classifier = BertSpamClassifier(bert_backend, bert_num_threads, bert_batch_size, cache_dir=Path(self.pickle_directory) / "onnx")
          
 
     def find_features(self, message):
@@ -68,6 +206,16 @@ class TextProcessing:
         return result
 
 
+    def is_spam_bert_batch(self, email_contents):
+        """
+        Classify a list of emails as spam or not spam using a pre-trained BERT model.
+        Args:
+            email_contents (list): The email contents to be classified.
+        Returns:
+            list: A list of booleans, True for each email classified as spam.
+        """
+        return [label == "SPAM" for label in self.bert_classifier.labels(email_contents)]
+
     def is_spam_bert(self, email_content):
         """
         Classify an email as spam or not spam using a pre-trained BERT model.
@@ -76,19 +224,8 @@ class TextProcessing:
         Returns:
             bool: True if the email is classified as spam, False otherwise.
         """
-        model_name = "distilbert-base-uncased-finetuned-sst-2-english"
-        tokenizer = AutoTokenizer.from_pretrained(model_name)
-        model = AutoModelForSequenceClassification.from_pretrained(model_name)
-        classification_pipeline = pipeline("text-classification", model=model, tokenizer=tokenizer)
-
-        result = classification_pipeline(email_content)
-        label = result[0]["label"]
+        return self.is_spam_bert_batch([email_content])[0]
 
-        if label == "SPAM":
-            return True
-        else:
-            return False
-        
     def load_templates(self, filename):
         with open(filename, "r", encoding="utf-8") as file:
             templates = json.load(file)
@@ -196,6 +333,17 @@ class TextProcessing:
         naive_bayes_result = self.classify_message(email_content) == "spam"
 
         return  bert_result or naive_bayes_result
+
+    def is_spam_combined_batch(self, email_contents):
+        """
+        Checks a list of email contents for spam like is_spam_combined, classifying them with BERT in batches.
+        Args:
+            email_contents (list): The email contents to be checked for spam.
+        Returns:
+            list: A list of booleans, True for each email content that might be flagged as spam.
+        """
+        bert_results = self.is_spam_bert_batch(email_contents)
+        return [bert_result or self.classify_message(email_content) == "spam" for bert_result, email_content in zip(bert_results, email_contents)]
     
 
     def generate_formal_text(self, text, nlp, language):
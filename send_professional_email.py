@@ -16,6 +16,8 @@ Usage:
 2. Run the script from the command line with the required arguments:
    recipient_email (one or more email addresses), subject, and message.
 3. Optionally, provide an attachment file path using the -add or --attachment flag.
+4. Optionally, use the -o or --output flag (with -f or --format) to render the emails to a Maildir, mbox file or
+   directory of .eml files instead of sending them.
 
 Example:
 python send_email.py "recipient@example.com" "Email Subject" "Email message" --attachment "/path/to/attachment.txt"
@@ -25,8 +27,9 @@ Note: The script currently supports English, German, and Romanian languages.
 from my_module.common_imports import *
 from my_module.utils import *
 
-from my_module import TextProcessing, EmailHandler, utility_function_1
-from my_module.email_handler import send_emails_concurrently
+from my_module import TextProcessing, EmailHandler, MailSink, utility_function_1
+from my_module.email_handler import send_emails_concurrently, render_emails_to_sink
+from my_module.text_processing import BERT_BACKENDS
 
 def main():
     """
@@ -40,7 +43,17 @@ def main():
     """
     pickle_directory, openai_api_key = utility_function_1()
 
-    text_processing = TextProcessing(pickle_directory, openai_api_key)
+    bert_backend = os.getenv("BERT_BACKEND") or "pytorch"
+    if bert_backend not in BERT_BACKENDS:
+        logging.critical(f"Invalid BERT_BACKEND: {bert_backend}. Options: {', '.join(BERT_BACKENDS)}.")
+        return
+
+    bert_num_threads = os.getenv("BERT_NUM_THREADS")
+    if bert_num_threads and not (bert_num_threads.isdigit() and int(bert_num_threads) > 0):
+        logging.critical(f"Invalid BERT_NUM_THREADS: {bert_num_threads}. Expected a positive integer.")
+        return
+
+    text_processing = TextProcessing(pickle_directory, openai_api_key, bert_backend=bert_backend, bert_num_threads=int(bert_num_threads) if bert_num_threads else None)
     email_handler = EmailHandler(text_processing)
 
     
@@ -52,6 +65,8 @@ def main():
     parser.add_argument("-p", "--person", dest="ai_person", help="The type of AI person and context for rewriting the text (e.g., 'Employer-GPT').", default="Employer-GPT")
     parser.add_argument("-s", "--service", dest="service", help="The email service to use for sending the email (e.g., 'gmail', 'yahoo', 'outlook', 'hotmail', 'live', 'exchange', 'aol', 'zoho', 'mail', 'gmx', 'protonmail', 'icloud').", default="gmail")
     parser.add_argument("-blank", "--blank", dest="blank", help="Send email without any formatting or text generation.", action="store_true", default=False)
+    parser.add_argument("-o", "--output", dest="output", help="Render the emails to this Maildir, mbox file or .eml directory instead of sending them (dry run / spool for later).", default=None)
+    parser.add_argument("-f", "--format", dest="sink_format", help="The output format used with --output.", choices=["eml", "maildir", "mbox"], default="eml")
     args = parser.parse_args()
 
     
@@ -59,6 +74,12 @@ def main():
     sender_password = os.getenv("SENDER_PASSWORD")
     
     try:
+        if args.output:
+            print("main: calling render_emails_to_sink")
+            sink = MailSink(args.output, args.sink_format)
+            render_emails_to_sink(email_handler, sink, sender_email, args.recipient_email, args.subject, args.message, args.attachment, args.ai_person, args.blank)
+            return
+
         print("main: calling send_emails_concurrently")
         send_emails_concurrently(email_handler, sender_email, sender_password, args.recipient_email, args.subject, args.message, args.attachment, args.ai_person, args.service, args.blank)
 
@@ -77,6 +98,8 @@ if __name__ == "__main__":
     parser.add_argument("-s", "--service", dest="service", help="The email service to use for sending the email (e.g., 'gmail', 'yahoo', 'outlook', 'hotmail', 'live', 'exchange', 'aol', 'zoho', 'mail', 'gmx', 'protonmail', 'icloud').", default="gmail")
     parser.add_argument("-help", action="store_true", help="Show this help message and exit.")
     parser.add_argument("-blank", "--blank", dest="blank", help="Send email without any formatting or text generation.", action="store_true", default=False)
+    parser.add_argument("-o", "--output", dest="output", help="Render the emails to this Maildir, mbox file or .eml directory instead of sending them (dry run / spool for later).", default=None)
+    parser.add_argument("-f", "--format", dest="sink_format", help="The output format used with --output.", choices=["eml", "maildir", "mbox"], default="eml")
 
     args = parser.parse_args()
 
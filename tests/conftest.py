@@ -0,0 +1,36 @@
+import importlib
+import sys
+from unittest import mock
+
+import pytest
+
+# The third-party libraries imported by my_module.common_imports
+STUBBED_MODULES = [
+    "stanza",
+    "spacy",
+    "spacy.lang",
+    *[f"spacy.lang.{language}" for language in ("fr", "es", "it", "nl", "pt", "ru", "sv", "zh")],
+    *[f"spacy.lang.{language}.examples" for language in ("fr", "es", "it", "nl", "pt", "ru", "sv", "zh")],
+    "transformers",
+    "torch",
+    "openai",
+    "nltk",
+    "nltk.tokenize",
+    "langid",
+    "conceptnet_lite",
+    "dotenv",
+]
+
+
+@pytest.fixture
+def stubbed_my_module():
+    """
+    Imports my_module with the NLP and machine learning libraries replaced by mocks, so the code around the models
+    can be tested without installing or downloading them. sys.modules is restored afterwards.
+    """
+    with mock.patch.dict(sys.modules):
+        for name in list(sys.modules):
+            if name in ("my_module", "send_professional_email") or name.startswith("my_module."):
+                del sys.modules[name]
+        sys.modules.update({name: mock.MagicMock() for name in STUBBED_MODULES})
+        yield importlib.import_module("my_module")
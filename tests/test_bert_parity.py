@@ -0,0 +1,53 @@
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+text_processing = pytest.importorskip("my_module.text_processing")
+
+SAMPLE_EMAILS = [
+    "Hi Anna, please find attached the report for the third quarter. Let me know if you have any questions.",
+    "CONGRATULATIONS!!! You have been selected to receive a FREE prize. Click here now to claim your reward!",
+    "Dear Mr. Popescu, I would like to schedule a meeting next Tuesday to discuss the project timeline.",
+    "Limited time offer: buy one, get one free. Unsubscribe at any time.",
+    "Thanks.",
+    "Unfortunately the delivery was late again and the package arrived damaged. I am very disappointed.",
+]
+TOLERANCE = 0.05
+
+
+@pytest.fixture(scope="module")
+def reference_scores():
+    return text_processing.BertSpamClassifier("pytorch").scores(SAMPLE_EMAILS)
+
+
+@pytest.mark.parametrize("backend", ["quantized", "onnx"])
+def test_backend_matches_pytorch(backend, reference_scores, tmp_path):
+    if backend == "onnx":
+        pytest.importorskip("optimum.onnxruntime")
+
+    scores = text_processing.BertSpamClassifier(backend, num_threads=1, cache_dir=tmp_path).scores(SAMPLE_EMAILS)
+
+    for expected, actual in zip(reference_scores, scores):
+        assert actual.index(max(actual)) == expected.index(max(expected))
+        assert max(abs(e - a) for e, a in zip(expected, actual)) <= TOLERANCE
+
+
+def test_batches_keep_input_order(reference_scores):
+    scores = text_processing.BertSpamClassifier("pytorch", batch_size=2).scores(SAMPLE_EMAILS)
+
+    for expected, actual in zip(reference_scores, scores):
+        assert actual == pytest.approx(expected, abs=1e-4)
+
+
+def test_onnx_export_is_cached(tmp_path):
+    pytest.importorskip("optimum.onnxruntime")
+
+    text_processing.BertSpamClassifier("onnx", cache_dir=tmp_path)
+
+    assert (tmp_path / "model.onnx").exists()
+    assert text_processing.BertSpamClassifier("onnx", cache_dir=tmp_path).labels(SAMPLE_EMAILS[:1])
+
+
+def test_invalid_backend():
+    with pytest.raises(ValueError):
+        text_processing.BertSpamClassifier("tensorrt")
@@ -0,0 +1,154 @@
+import json
+import mailbox
+from email import message_from_bytes
+from unittest import mock
+
+import pytest
+
+
+@pytest.fixture
+def mail_sink(stubbed_my_module):
+    return stubbed_my_module.mail_sink
+
+
+def render(sink, count):
+    for i in range(count):
+        sink.add("sender@example.com", f"recipient{i}@example.com", "Subject", f"Subject: Subject\n\nMessage {i}".encode("utf-8"))
+    sink.skip("sender@example.com", "spam@example.com", "Subject", "spam")
+    return json.loads(sink.close().read_text(encoding="utf-8"))
+
+
+def count_messages(path, sink_format):
+    if sink_format == "eml":
+        return len(list(path.glob("*.eml")))
+    elif sink_format == "maildir":
+        return len(mailbox.Maildir(path, create=False))
+    return len(mailbox.mbox(path, create=False))
+
+
+@pytest.mark.parametrize("sink_format", ["eml", "maildir", "mbox"])
+def test_sink_writes_messages_and_manifest(mail_sink, sink_format, tmp_path):
+    path = tmp_path / "outbox"
+
+    manifest = render(mail_sink.MailSink(path, sink_format, buffer_size=2), 5)
+
+    assert count_messages(path, sink_format) == 5
+    assert manifest["format"] == sink_format
+    rendered = [entry for entry in manifest["messages"] if entry["status"] == "rendered"]
+    skipped = [entry for entry in manifest["messages"] if entry["status"] == "skipped"]
+    assert [entry["recipient"] for entry in rendered] == [f"recipient{i}@example.com" for i in range(5)]
+    assert len({entry["file"] for entry in rendered}) == 5
+    assert skipped == [{"sender": "sender@example.com", "recipient": "spam@example.com", "subject": "Subject", "status": "skipped", "reason": "spam"}]
+
+
+@pytest.mark.parametrize("sink_format", ["eml", "maildir", "mbox"])
+def test_sink_appends_to_existing_output(mail_sink, sink_format, tmp_path):
+    path = tmp_path / "outbox"
+
+    render(mail_sink.MailSink(path, sink_format), 3)
+    render(mail_sink.MailSink(path, sink_format), 1)
+
+    assert count_messages(path, sink_format) == 4
+
+
+def test_sink_retries_failed_write_without_duplicates(mail_sink, tmp_path, monkeypatch):
+    sink = mail_sink.MailSink(tmp_path / "outbox", "maildir", buffer_size=10)
+    for i in range(3):
+        sink.add("sender@example.com", f"recipient{i}@example.com", "Subject", f"Subject: Subject\n\nMessage {i}".encode("utf-8"))
+
+    add = sink.mailbox.add
+    calls = []
+
+    def failing_add(message):
+        calls.append(message)
+        if len(calls) == 2:
+            raise OSError("disk full")
+        return add(message)
+
+    monkeypatch.setattr(sink.mailbox, "add", failing_add)
+    with pytest.raises(OSError):
+        sink.flush()
+    monkeypatch.setattr(sink.mailbox, "add", add)
+    manifest = json.loads(sink.close().read_text(encoding="utf-8"))
+
+    assert len(mailbox.Maildir(tmp_path / "outbox", create=False)) == 3
+    assert [entry["recipient"] for entry in manifest["messages"]] == [f"recipient{i}@example.com" for i in range(3)]
+
+
+def test_sink_manifest_for_current_directory(mail_sink, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path / "..")
+    sink = mail_sink.MailSink(tmp_path.name, "eml")
+
+    assert sink.manifest_path == tmp_path.with_name(tmp_path.name + ".manifest.json")
+
+    monkeypatch.chdir(tmp_path)
+    assert mail_sink.MailSink(".", "eml").manifest_path == tmp_path.with_name(tmp_path.name + ".manifest.json")
+
+
+def test_invalid_sink_format(mail_sink, tmp_path):
+    with pytest.raises(ValueError):
+        mail_sink.MailSink(tmp_path, "pst")
+
+
+def test_sink_adds_envelope_headers(mail_sink, tmp_path):
+    sink = mail_sink.MailSink(tmp_path / "outbox", "eml")
+    sink.add("sender@example.com", "recipient@example.com", "Subject", b"Subject: Subject\n\nMessage")
+    sink.add("sender@example.com", "recipient@example.com", "Subject", b"To: Someone <recipient@example.com>\nSubject: Subject\n\nMessage")
+    sink.close()
+
+    messages = [message_from_bytes(path.read_bytes()) for path in (tmp_path / "outbox").glob("*.eml")]
+
+    for message in messages:
+        assert message["From"] == "sender@example.com"
+        assert message["Date"]
+        assert message.get_all("To") in (["recipient@example.com"], ["Someone <recipient@example.com>"])
+        assert message.get_payload() == "Message"
+    assert len({message["Message-ID"] for message in messages}) == 2
+
+
+@pytest.fixture
+def email_handler(stubbed_my_module):
+    text_processing = mock.MagicMock()
+
+    def format_message(message, recipient_email, ai_person):
+        if recipient_email.startswith("broken"):
+            raise RuntimeError("OpenAI request failed")
+        return f"{message} for {recipient_email}"
+
+    text_processing.format_message.side_effect = format_message
+    text_processing.is_spam_bert_batch.side_effect = lambda email_contents: ["bert-spam" in email_content for email_content in email_contents]
+    text_processing.classify_message.side_effect = lambda email_content: "spam" if "bayes-spam" in email_content else "not spam"
+    return stubbed_my_module.EmailHandler(text_processing)
+
+
+def test_render_emails_to_sink(stubbed_my_module, mail_sink, email_handler, tmp_path):
+    recipients = ["a@example.com", "broken@example.com", "bert-spam@example.com", "bayes-spam@example.com", "b@example.com"]
+    sink = mail_sink.MailSink(tmp_path / "outbox", "mbox", buffer_size=2)
+
+    manifest_path = stubbed_my_module.email_handler.render_emails_to_sink(email_handler, sink, "sender@example.com", recipients, "Subject", "Hello", None, "Employer-GPT")
+
+    entries = {entry["recipient"]: entry for entry in json.loads(manifest_path.read_text(encoding="utf-8"))["messages"]}
+    assert set(entries) == set(recipients)
+    assert entries["a@example.com"]["status"] == "rendered"
+    assert entries["b@example.com"]["status"] == "rendered"
+    assert entries["broken@example.com"] == {"sender": "sender@example.com", "recipient": "broken@example.com", "subject": "Subject", "status": "error", "reason": "OpenAI request failed"}
+    assert entries["bert-spam@example.com"]["status"] == "skipped"
+    assert entries["bayes-spam@example.com"]["reason"] == "spam"
+
+    messages = list(mailbox.mbox(tmp_path / "outbox", create=False))
+    assert sorted(message["To"] for message in messages) == ["a@example.com", "b@example.com"]
+    assert sorted(message.get_payload().strip() for message in messages) == ["Hello for a@example.com", "Hello for b@example.com"]
+    # Two chunks of two recipients were classified, then the last recipient on its own
+    assert len(email_handler.text_processing.is_spam_bert_batch.call_args_list) == 3
+
+
+def test_render_emails_to_sink_spam_check_failure_only_affects_its_chunk(stubbed_my_module, mail_sink, email_handler, tmp_path):
+    email_handler.text_processing.is_spam_bert_batch.side_effect = [RuntimeError("Already borrowed"), [False, False]]
+    recipients = ["a@example.com", "b@example.com", "c@example.com", "d@example.com"]
+    sink = mail_sink.MailSink(tmp_path / "outbox", "eml", buffer_size=2)
+
+    manifest_path = stubbed_my_module.email_handler.render_emails_to_sink(email_handler, sink, "sender@example.com", recipients, "Subject", "Hello", None, "Employer-GPT")
+
+    statuses = {entry["recipient"]: entry["status"] for entry in json.loads(manifest_path.read_text(encoding="utf-8"))["messages"]}
+    assert statuses == {"a@example.com": "error", "b@example.com": "error", "c@example.com": "rendered", "d@example.com": "rendered"}
+    assert len(list((tmp_path / "outbox").glob("*.eml"))) == 2
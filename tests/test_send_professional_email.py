@@ -0,0 +1,56 @@
+import importlib
+import logging
+import sys
+from unittest import mock
+
+import pytest
+
+
+@pytest.fixture
+def script(stubbed_my_module, monkeypatch):
+    script = importlib.import_module("send_professional_email")
+    monkeypatch.setattr(script, "utility_function_1", lambda: ("pickles", "api-key"))
+    monkeypatch.setattr(script, "TextProcessing", mock.MagicMock())
+    monkeypatch.setattr(sys, "argv", ["send_professional_email.py", "recipient@example.com", "Subject", "Message"])
+    return script
+
+
+@pytest.mark.parametrize("variable, value", [("BERT_BACKEND", "tensorrt"), ("BERT_NUM_THREADS", "four"), ("BERT_NUM_THREADS", "0")])
+def test_main_rejects_invalid_bert_settings(script, monkeypatch, caplog, variable, value):
+    monkeypatch.setenv(variable, value)
+    send_emails_concurrently = mock.MagicMock()
+    monkeypatch.setattr(script, "send_emails_concurrently", send_emails_concurrently)
+
+    with caplog.at_level(logging.CRITICAL):
+        script.main()
+
+    assert f"Invalid {variable}: {value}" in caplog.text
+    script.TextProcessing.assert_not_called()
+    send_emails_concurrently.assert_not_called()
+
+
+def test_main_passes_bert_settings(script, monkeypatch):
+    monkeypatch.setenv("BERT_BACKEND", "onnx")
+    monkeypatch.setenv("BERT_NUM_THREADS", "4")
+    monkeypatch.setattr(script, "send_emails_concurrently", mock.MagicMock())
+
+    script.main()
+
+    script.TextProcessing.assert_called_once_with("pickles", "api-key", bert_backend="onnx", bert_num_threads=4)
+
+
+@pytest.mark.parametrize("sink_format", ["eml", "maildir", "mbox"])
+def test_main_renders_to_sink(script, monkeypatch, tmp_path, sink_format):
+    output = tmp_path / "outbox"
+    monkeypatch.setattr(sys, "argv", sys.argv + ["-o", str(output), "-f", sink_format])
+    monkeypatch.setattr(script, "send_emails_concurrently", mock.MagicMock())
+    render_emails_to_sink = mock.MagicMock()
+    monkeypatch.setattr(script, "render_emails_to_sink", render_emails_to_sink)
+
+    script.main()
+
+    script.send_emails_concurrently.assert_not_called()
+    sink = render_emails_to_sink.call_args.args[1]
+    assert sink.path == output
+    assert sink.sink_format == sink_format
+    assert render_emails_to_sink.call_args.args[2:] == (None, ["recipient@example.com"], "Subject", "Message", None, "Employer-GPT", False)
@@ -0,0 +1,62 @@
+import pickle
+
+import pytest
+
+
+class KeywordClassifier:
+    """A picklable stand-in for the naive Bayes spam classifier that flags messages containing "prize"."""
+
+    def classify(self, features):
+        return "spam" if features.get("prize") else "not spam"
+
+
+class FakeBertClassifier:
+    def __init__(self, spam_contents):
+        self.spam_contents = spam_contents
+        self.calls = []
+
+    def labels(self, email_contents):
+        self.calls.append(list(email_contents))
+        return ["SPAM" if email_content in self.spam_contents else "POSITIVE" for email_content in email_contents]
+
+
+@pytest.fixture
+def text_processing(stubbed_my_module, tmp_path, monkeypatch):
+    with open(tmp_path / "spam_classifier.pickle", "wb") as f:
+        pickle.dump(KeywordClassifier(), f)
+    with open(tmp_path / "word_features.pickle", "wb") as f:
+        pickle.dump(["prize"], f)
+
+    text_processing_module = stubbed_my_module.text_processing
+    monkeypatch.setattr(text_processing_module, "word_tokenize", str.split)
+    monkeypatch.setattr(text_processing_module.TextProcessing, "load_templates", lambda self, filename: {"greeting": "Hello"})
+
+    return stubbed_my_module.TextProcessing(str(tmp_path), "api-key", bert_backend="quantized", bert_num_threads=2)
+
+
+def test_init_loads_models(text_processing):
+    assert text_processing.templates == {"greeting": "Hello"}
+    assert text_processing.bert_classifier.backend == "quantized"
+    assert text_processing.bert_classifier.num_threads == 2
+    assert callable(text_processing.format_message)
+
+
+def test_bert_classifier_rejects_invalid_backend(stubbed_my_module):
+    with pytest.raises(ValueError):
+        stubbed_my_module.text_processing.BertSpamClassifier("tensorrt")
+
+
+def test_is_spam_combined(text_processing):
+    text_processing.bert_classifier = FakeBertClassifier({"bert spam"})
+
+    assert text_processing.is_spam_combined("bert spam")
+    assert text_processing.is_spam_combined("you won a prize")
+    assert not text_processing.is_spam_combined("see you tomorrow")
+
+
+def test_is_spam_combined_batch(text_processing):
+    text_processing.bert_classifier = FakeBertClassifier({"bert spam"})
+    email_contents = ["see you tomorrow", "bert spam", "you won a prize"]
+
+    assert text_processing.is_spam_combined_batch(email_contents) == [False, True, True]
+    assert text_processing.bert_classifier.calls == [email_contents]